@@ -10,19 +10,40 @@ Features:
 - MariaDB database integration
 - CORS-enabled for frontend integration
 
+Running outside Docker (uvloop event loop + httptools HTTP parser):
+    uvicorn main:app --loop uvloop --http httptools --workers $(nproc)
+
 Author: Vehicle Rental System Team
 License: MIT
 """
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, Query, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from typing import Optional, Literal, List
+from typing import Annotated, Optional, Literal, List
 from pydantic import BaseModel, EmailStr, Field
+from cachetools import TTLCache
 from datetime import date
+from decimal import Decimal
+from types import MappingProxyType
+import asyncio
+import base64
+import hashlib
+import logging
 import os
+import re
+import aiomysql
 import databases
+import orjson
+
+# Prefer libuv's event loop when available; uvicorn also picks it (and httptools)
+# automatically, this covers other ASGI servers and scripts importing the app.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 
 # =========================================================
@@ -30,13 +51,59 @@ import databases
 # =========================================================
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-database = databases.Database(DATABASE_URL)
+
+# Serve /static from this process (dev only); in production nginx serves it (see nginx/static.conf)
+SERVE_STATIC = os.getenv("SERVE_STATIC", "0") == "1"
+
+# Connection pool sizing (aiomysql backend); database.connect() opens min_size connections up
+# front, and recycle happens before MariaDB's wait_timeout drops idle links
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+database = databases.Database(
+    DATABASE_URL,
+    min_size=DB_POOL_MIN_SIZE,
+    max_size=DB_POOL_MAX_SIZE,
+    pool_recycle=DB_POOL_RECYCLE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Strong references to fire-and-forget queries so they are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_background_task_done(task: asyncio.Task) -> None:
+    """Release a finished background query and log its failure, if any."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background query failed", exc_info=task.exception())
+
+
+def _run_in_background(coro) -> None:
+    """Schedule a query whose result the response does not depend on."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
 
 
 # =========================================================
 # FastAPI Application Setup
 # =========================================================
 
+def _pool_stats() -> Optional[dict]:
+    """Return current connection pool usage, or None when the pool is not open."""
+    pool = getattr(database._backend, "_pool", None)
+    if pool is None:
+        return None
+    return {
+        "size": pool.size,
+        "checked_out": pool.size - pool.freesize,
+        "max_size": pool.maxsize,
+    }
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -48,6 +115,39 @@ async def lifespan(app: FastAPI):
         await database.disconnect()
 
 
+def _orjson_default(obj):
+    """Serialize types orjson doesn't handle natively (DECIMAL columns)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (native date/datetime, much faster than stdlib json).
+
+    Only used on the list routes that return plain rows (no response_model): routes with
+    a response_model keep the default class so FastAPI can serialize them straight to
+    JSON bytes through Pydantic.
+    """
+
+    # Encoded once; spliced into every response instead of re-encoding media_type
+    default_headers: list[tuple[bytes, bytes]] = [(b"content-type", b"application/json")]
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+    def init_headers(self, headers=None) -> None:
+        if headers is not None:
+            super().init_headers(headers)
+            return
+        if self.status_code < 200 or self.status_code in (204, 304):
+            self.raw_headers = self.default_headers.copy()
+        else:
+            content_length = (b"content-length", str(len(self.body)).encode("latin-1"))
+            self.raw_headers = [content_length] + self.default_headers
+
+
 app = FastAPI(
     title="Vehicle Rental API",
     description="Backend API for vehicle rental management system",
@@ -57,14 +157,70 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Fixed CORS headers, encoded once (the allowed origin is echoed per request)
+_CORS_HEADERS_BYTES: list[tuple[bytes, bytes]] = [
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-expose-headers", b"X-Next-Cursor"),
+    (b"vary", b"Origin"),
+]
+_CORS_PREFLIGHT_HEADERS_BYTES: list[tuple[bytes, bytes]] = [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+]
+
+
+class CORSFastPathMiddleware:
+    """
+    Allow-all CORS (dev mode) as a bare ASGI middleware.
+
+    Behaves like CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]): preflights are answered here
+    with a 204, other cross-origin responses get the origin echoed back.
+    Requests without an Origin header pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin)] + _CORS_HEADERS_BYTES
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            preflight_headers = cors_headers + _CORS_PREFLIGHT_HEADERS_BYTES
+            if request_headers is not None:
+                preflight_headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": preflight_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
 # Enable CORS for frontend integration (dev mode - all origins allowed)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # TODO: Restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# TODO: Restrict in production
+app.add_middleware(CORSFastPathMiddleware)
 
 
 # =========================================================
@@ -76,7 +232,10 @@ class AuthLoginRequest(BaseModel):
     email: EmailStr = Field(..., description="User's email address")
     password: str = Field(..., min_length=1, description="User's password")
     
+    # Immutable, reject unknown keys; whitespace is NOT stripped (it is part of the password)
     model_config = {
+        "frozen": True,
+        "extra": "forbid",
         "json_schema_extra": {
             "examples": [{
                 "email": "john.doe@example.com",
@@ -94,6 +253,8 @@ class AuthRegisterRequest(BaseModel):
     password: str = Field(..., min_length=1, description="Password (min 1 char for demo)")
     
     model_config = {
+        "frozen": True,
+        "extra": "forbid",
         "json_schema_extra": {
             "examples": [{
                 "name": "John Doe",
@@ -156,18 +317,94 @@ class RentalResponse(BaseModel):
     end_date: date
     total_days: int
     total_price: float
-    
-class RentalCreate(BaseModel):
-    user_id: int
-    vehicle_id: int
-    start_date: date
-    end_date: date
 
 # =========================================================
 # Lifespan handled via async context manager above
 # =========================================================
 
 
+# =========================================================
+# Prepared Statements - fixed hot-path queries
+# =========================================================
+# databases rebuilds and compiles a SQLAlchemy text() clause on every call.
+# These statements never change, so they are converted to the driver's
+# %(name)s placeholders once at import and executed directly on the pooled
+# aiomysql connection. (The MySQL text protocol used by aiomysql has no
+# server-side prepare; SQL-level PREPARE/EXECUTE would cost extra round-trips.)
+
+_PREPARED_SQL: dict[str, str] = {
+    "login": """
+        SELECT user_id, name, email
+        FROM User
+        WHERE email = :email
+          AND password_hash = :password_hash
+          AND deleted_at IS NULL
+    """,
+    "rental_overlap": """
+        SELECT EXISTS(
+            SELECT 1
+            FROM Rental USE INDEX (idx_rental_vehicle_dates)
+            WHERE vehicle_id = :vehicle_id
+              AND start_date <= :end_date
+              AND end_date >= :start_date
+        ) AS overlap,
+        (
+            SELECT status
+            FROM Vehicle
+            WHERE vehicle_id = :vehicle_id
+              AND deleted_at IS NULL
+        ) AS vehicle_status
+    """,
+    "vehicle_pricing": """
+        SELECT price_per_day
+        FROM Vehicle
+        WHERE vehicle_id = :vehicle_id
+          AND deleted_at IS NULL
+    """,
+    "rental_insert": """
+        INSERT INTO Rental (
+            user_id,
+            vehicle_id,
+            start_date,
+            end_date,
+            price_at_rental,
+            total_cost
+        ) VALUES (
+            :user_id,
+            :vehicle_id,
+            :start_date,
+            :end_date,
+            :price_at_rental,
+            :total_cost
+        )
+    """,
+}
+
+
+def _to_pyformat(sql: str) -> str:
+    """Rewrite :name bind parameters to the driver's %(name)s style."""
+    return re.sub(r"(?<![:\w]):(\w+)", r"%(\1)s", sql.replace("%", "%%"))
+
+
+_PREPARED: dict[str, str] = {name: _to_pyformat(sql) for name, sql in _PREPARED_SQL.items()}
+
+
+async def _fetch_one_prepared(name: str, values: dict) -> Optional[dict]:
+    """Run a registered SELECT on the pooled connection and return the first row as a dict."""
+    async with database.connection() as connection:
+        async with connection.raw_connection.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(_PREPARED[name], values)
+            return await cursor.fetchone()
+
+
+async def _execute_prepared(name: str, values: dict) -> int:
+    """Run a registered write statement on the pooled connection and return lastrowid."""
+    async with database.connection() as connection:
+        async with connection.raw_connection.cursor() as cursor:
+            await cursor.execute(_PREPARED[name], values)
+            return cursor.lastrowid
+
+
 # =========================================================
 # Core Endpoints
 # =========================================================
@@ -184,80 +421,222 @@ async def health():
     Health check endpoint for monitoring and load balancers.
     
     Returns:
-        dict: Status object with API and database connection state
+        dict: Status object with API and database connection state,
+        plus connection pool usage when the pool is open
     """
     db_state = "connected" if getattr(database, "is_connected", False) else "disconnected"
-    return {"status": "ok", "db": db_state}
+    result = {"status": "ok", "db": db_state}
+    pool = _pool_stats()
+    if pool is not None:
+        result["pool"] = pool
+    return result
 
 
 # =========================================================
 # Vehicle Endpoints
 # =========================================================
 
-@app.get("/vehicles")
+# Optional /vehicles filters, in mask bit order (bit 0 = status, bit 1 = make, ...)
+_VEHICLE_FILTER_SQL = (
+    "v.status = :status",
+    "v.make LIKE :make",
+    "v.model LIKE :model",
+    "v.year >= :year_from",
+    "v.year <= :year_to",
+    "v.price_per_day >= :min_price",
+    "v.price_per_day <= :max_price",
+    "(v.make LIKE :search OR v.model LIKE :search OR v.year LIKE :search)",
+)
+_VEHICLE_SORT_SHIFT = len(_VEHICLE_FILTER_SQL)
+_VEHICLE_DIR_SHIFT = _VEHICLE_SORT_SHIFT + 2
+_VEHICLE_CURSOR_SHIFT = _VEHICLE_DIR_SHIFT + 1
+
+# Allowed /vehicles enum parameters, defined once so FastAPI/Pydantic build their schemas once
+VehicleStatus = Literal["available", "rented", "maintenance"]
+VehicleSortBy = Literal["created_at", "price", "year"]
+SortDir = Literal["asc", "desc"]
+
+# sort_by value -> index into _VEHICLE_SORT_COLUMNS (read-only; keys mirror VehicleSortBy)
+_VEHICLE_SORT_INDEX = MappingProxyType({"created_at": 0, "price": 1, "year": 2})
+_VEHICLE_SORT_COLUMNS = ("created_at", "price_per_day", "year")
+_VEHICLE_SORT_DIRS = ("DESC", "ASC")
+
+_VEHICLE_QUERY_TEMPLATE = """
+    SELECT *
+    FROM Vehicle v
+    WHERE %s
+    ORDER BY v.%s %s, v.vehicle_id %s
+    LIMIT :limit OFFSET :offset
+    """
+
+# Keyset predicate: rows strictly after the cursor's (sort value, vehicle_id) in listing
+# order. Spelled out rather than as a row comparison so MariaDB plans a range scan on the
+# (sort column, vehicle_id) indexes.
+_VEHICLE_CURSOR_SQL = (
+    "(v.%(col)s %(op)s :cursor_value"
+    " OR (v.%(col)s = :cursor_value AND v.vehicle_id %(op)s :cursor_id))"
+)
+
+
+def _build_vehicle_queries() -> dict[int, str]:
+    """Precompile every filter/sort/direction combination of the /vehicles query."""
+    queries: dict[int, str] = {}
+    for filter_mask in range(1 << len(_VEHICLE_FILTER_SQL)):
+        where = ["v.deleted_at IS NULL"]
+        where.extend(
+            sql for bit, sql in enumerate(_VEHICLE_FILTER_SQL) if filter_mask >> bit & 1
+        )
+        for sort_idx, sort_column in enumerate(_VEHICLE_SORT_COLUMNS):
+            for dir_bit, direction in enumerate(_VEHICLE_SORT_DIRS):
+                cursor_sql = _VEHICLE_CURSOR_SQL % {
+                    "col": sort_column,
+                    "op": "<" if direction == "DESC" else ">",
+                }
+                for cursor_bit in (0, 1):
+                    where_sql = " AND ".join(where + [cursor_sql] if cursor_bit else where)
+                    key = (
+                        filter_mask
+                        | sort_idx << _VEHICLE_SORT_SHIFT
+                        | dir_bit << _VEHICLE_DIR_SHIFT
+                        | cursor_bit << _VEHICLE_CURSOR_SHIFT
+                    )
+                    queries[key] = _VEHICLE_QUERY_TEMPLATE % (
+                        where_sql, sort_column, direction, direction
+                    )
+    return queries
+
+
+_VEHICLE_QUERIES: dict[int, str] = _build_vehicle_queries()
+
+
+def _encode_vehicle_cursor(sort_by: str, sort_dir: str, row) -> str:
+    """Opaque keyset cursor pointing just past ``row`` in the given listing order."""
+    column = _VEHICLE_SORT_COLUMNS[_VEHICLE_SORT_INDEX[sort_by]]
+    payload = orjson.dumps(
+        [sort_by, sort_dir, row[column], row["vehicle_id"]], default=_orjson_default
+    )
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def _decode_vehicle_cursor(cursor: str, sort_by: str, sort_dir: str) -> tuple:
+    """Return ``(sort value, vehicle_id)`` from a cursor issued for the same ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort_by, cursor_sort_dir, value, vehicle_id = orjson.loads(raw)
+    except (ValueError, TypeError):  # binascii.Error and orjson.JSONDecodeError are ValueErrors
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Both values are bound into the keyset predicate: only scalars are acceptable
+    if (
+        not isinstance(value, (str, int, float))
+        or not isinstance(vehicle_id, int)
+        or isinstance(value, bool)
+        or isinstance(vehicle_id, bool)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (cursor_sort_by, cursor_sort_dir) != (sort_by, sort_dir):
+        raise HTTPException(status_code=400, detail="Cursor does not match sort_by/sort_dir")
+    return value, vehicle_id
+
+
+# Full /vehicles parameter tuple -> rows. Absorbs bursts of identical listings (e.g. the
+# default homepage query); clear it from any endpoint that modifies Vehicle.
+_vehicle_list_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+
+@app.get("/vehicles", response_class=OrjsonResponse)
 async def list_vehicles(
-    status: str | None = Query(None),
-    make: str | None = Query(None),
-    model: str | None = Query(None),
-    year_from: int | None = Query(None),
-    year_to: int | None = Query(None),
-    min_price: int | None = Query(None),
-    max_price: int | None = Query(None),
-    search: str | None = Query(None),
-    sort_by: str = Query("created_at"),
-    sort_dir: str = Query("desc"),
-    limit: int = Query(12),
-    offset: int = Query(0)
+    response: Response,
+    status: Annotated[Optional[VehicleStatus], Query(description="Vehicle availability status")] = None,
+    make: Annotated[Optional[str], Query(description="Manufacturer (substring match)")] = None,
+    model: Annotated[Optional[str], Query(description="Model name (substring match)")] = None,
+    year_from: Annotated[Optional[int], Query(ge=1900, le=2100, description="Min year (inclusive)")] = None,
+    year_to: Annotated[Optional[int], Query(ge=1900, le=2100, description="Max year (inclusive)")] = None,
+    min_price: Annotated[Optional[float], Query(ge=0, description="Min daily price (inclusive)")] = None,
+    max_price: Annotated[Optional[float], Query(ge=0, description="Max daily price (inclusive)")] = None,
+    search: Annotated[Optional[str], Query(description="Free-text match on make, model or year")] = None,
+    sort_by: Annotated[VehicleSortBy, Query(description="Sort field")] = "created_at",
+    sort_dir: Annotated[SortDir, Query(description="Sort direction")] = "desc",
+    limit: Annotated[int, Query(ge=1, le=100, description="Results per page (1-100)")] = 20,
+    offset: Annotated[
+        int, Query(ge=0, deprecated=True, description="Skip N results; prefer cursor")
+    ] = 0,
+    cursor: Annotated[
+        Optional[str], Query(description="X-Next-Cursor value from the previous page")
+    ] = None,
 ):
-    where = ["v.deleted_at IS NULL"]
-    values = {}
+    """
+    List vehicles, newest first by default.
+
+    When a full page is returned, the ``X-Next-Cursor`` response header carries a cursor
+    for the following page. Passing it back as ``cursor`` (with the same filters and sort)
+    seeks straight past the last row instead of scanning and discarding ``offset`` rows.
+    """
+    cache_key = (
+        status, make, model, year_from, year_to, min_price, max_price,
+        search, sort_by, sort_dir, limit, offset, cursor,
+    )
+    rows = _vehicle_list_cache.get(cache_key)
+    if rows is None:
+        rows = await _fetch_vehicle_page(
+            status, make, model, year_from, year_to, min_price, max_price,
+            search, sort_by, sort_dir, limit, offset, cursor,
+        )
+        _vehicle_list_cache[cache_key] = rows
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = _encode_vehicle_cursor(sort_by, sort_dir, rows[-1])
+    return rows
+
+
+async def _fetch_vehicle_page(
+    status, make, model, year_from, year_to, min_price, max_price,
+    search, sort_by, sort_dir, limit, offset, cursor,
+):
+    mask = 0
+    values = {"limit": limit, "offset": offset}
 
     if status:
-        where.append("v.status = :status")
+        mask |= 1 << 0
         values["status"] = status
 
     if make:
-        where.append("v.make LIKE :make")
+        mask |= 1 << 1
         values["make"] = f"%{make}%"
 
     if model:
-        where.append("v.model LIKE :model")
+        mask |= 1 << 2
         values["model"] = f"%{model}%"
 
     if year_from:
-        where.append("v.year >= :year_from")
+        mask |= 1 << 3
         values["year_from"] = year_from
 
     if year_to:
-        where.append("v.year <= :year_to")
+        mask |= 1 << 4
         values["year_to"] = year_to
 
     if min_price:
-        where.append("v.price_per_day >= :min_price")
+        mask |= 1 << 5
         values["min_price"] = min_price
 
     if max_price:
-        where.append("v.price_per_day <= :max_price")
+        mask |= 1 << 6
         values["max_price"] = max_price
 
     if search:
-        where.append("(v.make LIKE :search OR v.model LIKE :search OR v.year LIKE :search)")
+        mask |= 1 << 7
         values["search"] = f"%{search}%"
 
-    where_sql = " AND ".join(where)
-
-    query = f"""
-    SELECT *
-    FROM Vehicle v
-    WHERE {where_sql}
-    ORDER BY v.{sort_by} {sort_dir}
-    LIMIT :limit OFFSET :offset
-    """
+    mask |= _VEHICLE_SORT_INDEX[sort_by] << _VEHICLE_SORT_SHIFT
+    if sort_dir == "asc":
+        mask |= 1 << _VEHICLE_DIR_SHIFT
 
-    values["limit"] = limit
-    values["offset"] = offset
+    if cursor:
+        mask |= 1 << _VEHICLE_CURSOR_SHIFT
+        values["cursor_value"], values["cursor_id"] = _decode_vehicle_cursor(cursor, sort_by, sort_dir)
+        values["offset"] = 0
 
-    return await database.fetch_all(query, values)
+    return await database.fetch_all(_VEHICLE_QUERIES[mask], values)
 
 @app.get("/vehicles/count")
 async def get_vehicle_count(
@@ -312,13 +691,24 @@ async def get_vehicle_count(
 # Authentication Endpoints
 # =========================================================
 
+def _hash_password(password: str) -> str:
+    """
+    Hash a password the same way MariaDB's SHA2(:password, 256) does.
+
+    Produces the lowercase hex digest, so hashes stored by earlier versions
+    (which hashed inside the database) keep matching. No salt, demo only.
+    """
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
 @app.post("/auth/register", response_model=AuthResponse, status_code=201, tags=["Authentication"])
 async def register(payload: AuthRegisterRequest):
     """
     Register a new user account.
     
     Creates a new user with hashed password stored in the database.
-    Password hashing uses MariaDB's SHA2-256 built-in function.
+    The SHA2-256 hash is computed in the application, so the plaintext
+    password never reaches the database.
     
     **Security Note:** SHA2-256 is used for educational/demo purposes.
     Production systems should use bcrypt or Argon2 with proper salting.
@@ -335,27 +725,22 @@ async def register(payload: AuthRegisterRequest):
         HTTPException 500: Database or server error
     """
     try:
-        # Insert new user with SHA2-hashed password
-        query = """
+        # Insert new user with hashed password and read it back in the same round-trip
+        # (INSERT ... RETURNING requires MariaDB 10.5+)
+        user = await database.fetch_one(
+            """
             INSERT INTO User (name, email, phone, password_hash)
-            VALUES (:name, :email, :phone, SHA2(:password, 256))
-        """
-        result = await database.execute(
-            query,
+            VALUES (:name, :email, :phone, :password_hash)
+            RETURNING user_id, name, email
+            """,
             {
                 "name": payload.name,
                 "email": payload.email,
                 "phone": payload.phone,
-                "password": payload.password,
+                "password_hash": _hash_password(payload.password),
             },
         )
         
-        # Fetch the newly created user
-        user = await database.fetch_one(
-            "SELECT user_id, name, email FROM User WHERE user_id = :uid",
-            {"uid": result},
-        )
-        
         return AuthResponse(
             success=True,
             message="Registration successful",
@@ -382,13 +767,12 @@ async def login(payload: AuthLoginRequest):
     """
     Authenticate user and initiate session.
     
-    Verifies user credentials by comparing the provided password against
-    the stored SHA2-256 hash in the database. Updates last login timestamp
-    on successful authentication.
+    Verifies user credentials by comparing the SHA2-256 hash of the provided
+    password against the stored hash. Updates last login timestamp on
+    successful authentication.
     
-    **Security Note:** Password verification happens in the database using
-    SHA2-256 for demo purposes. Production systems should use bcrypt/Argon2
-    with application-level verification.
+    **Security Note:** Unsalted SHA2-256 is used for demo purposes.
+    Production systems should use bcrypt/Argon2.
     
     Args:
         payload: Login credentials (email and password)
@@ -401,16 +785,10 @@ async def login(payload: AuthLoginRequest):
         HTTPException 422: Invalid input format (Pydantic validation)
     """
     # Query user with matching email and password hash
-    # Note: Password verification happens in SQL via SHA2 comparison
-    user = await database.fetch_one(
-        """
-        SELECT user_id, name, email
-        FROM User
-        WHERE email = :email 
-          AND password_hash = SHA2(:password, 256)
-          AND deleted_at IS NULL
-        """,
-        {"email": payload.email, "password": payload.password},
+    # Note: the hash is computed here; only the digest is sent to the database
+    user = await _fetch_one_prepared(
+        "login",
+        {"email": payload.email, "password_hash": _hash_password(payload.password)},
     )
     
     if not user:
@@ -420,11 +798,11 @@ async def login(payload: AuthLoginRequest):
             detail="Invalid email or password",
         )
     
-    # Update last login timestamp for activity tracking
-    await database.execute(
+    # Update last login timestamp for activity tracking (not awaited; the response doesn't need it)
+    _run_in_background(database.execute(
         "UPDATE User SET last_login_at = CURRENT_TIMESTAMP WHERE user_id = :uid",
         {"uid": user["user_id"]},
-    )
+    ))
     
     return AuthResponse(
         success=True,
@@ -439,7 +817,13 @@ async def login(payload: AuthLoginRequest):
 # Rental Endpoints
 # =========================================================
 
-@app.get("/rentals", response_model=List[RentalResponse], tags=["Rentals"])
+@app.get(
+    "/rentals",
+    response_model=None,
+    response_class=OrjsonResponse,
+    tags=["Rentals"],
+    responses={200: {"model": List[RentalResponse]}},
+)
 async def list_rentals(
     user_id: Optional[int] = Query(None, gt=0, description="Filter by user ID", examples=[1]),
     vehicle_id: Optional[int] = Query(None, gt=0, description="Filter by vehicle ID", examples=[5]),
@@ -478,7 +862,22 @@ async def list_rentals(
     """
 
     rows = await database.fetch_all(query, values)
-    return [dict(row) for row in rows]
+    # Built positionally from the SELECT column order; response validation is skipped
+    # (response_model=None) since the shape is fixed by the query above.
+    return [
+        {
+            "rental_id": r[0],
+            "user_id": r[1],
+            "vehicle_id": r[2],
+            "make": None,
+            "model": None,
+            "start_date": r[3],
+            "end_date": r[4],
+            "total_days": r[5],
+            "total_price": float(r[6]),
+        }
+        for r in rows
+    ]
 
 @app.get(
     "/rentals/{rental_id}",
@@ -504,8 +903,10 @@ async def get_rental_by_id(rental_id: int):
 
 @app.get(
     "/users/{user_id}/rentals",
-    response_model=List[RentalResponse],
+    response_model=None,
+    response_class=OrjsonResponse,
     tags=["Rentals"],
+    responses={200: {"model": List[RentalResponse]}},
 )
 async def get_user_rentals(
     user_id: int,
@@ -546,8 +947,40 @@ async def get_user_rentals(
 
     values.update({"limit": limit, "offset": skip})
     rows = await database.fetch_all(query=query, values=values)
-    return [dict(r) for r in rows]
+    # Built positionally from the SELECT column order (see list_rentals)
+    return [
+        {
+            "rental_id": r[0],
+            "user_id": r[1],
+            "vehicle_id": r[2],
+            "make": r[3],
+            "model": r[4],
+            "start_date": r[5],
+            "end_date": r[6],
+            "total_days": r[7],
+            "total_price": float(r[8]),
+        }
+        for r in rows
+    ]
+
 
+# vehicle_id -> price_per_day for live vehicles. Only the price is cached: status and
+# deletion are read fresh by the rental_overlap statement on every booking. Misses are
+# not cached so newly inserted vehicles show up immediately; price edits become
+# visible within the TTL.
+_vehicle_pricing_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+
+async def _get_vehicle_price(vehicle_id: int) -> Optional[float]:
+    """Return price_per_day for a non-deleted vehicle, or None if not found."""
+    price = _vehicle_pricing_cache.get(vehicle_id)
+    if price is None:
+        row = await _fetch_one_prepared("vehicle_pricing", {"vehicle_id": vehicle_id})
+        if not row:
+            return None
+        price = float(row["price_per_day"])
+        _vehicle_pricing_cache[vehicle_id] = price
+    return price
 
 
 @app.post(
@@ -588,77 +1021,51 @@ async def create_rental(payload: RentalCreateRequest):
             detail="Invalid date range: start_date must be before end_date",
         )
 
-    # 2) Check for ANY overlapping rental for the same vehicle
+    # 2) Check for ANY overlapping rental for the same vehicle (the same statement
+    #    reads the vehicle's live status) and fetch its price (cached) concurrently;
+    #    the two lookups are independent.
     #    NOTE: we do NOT filter by deleted_at here, because the DB UNIQUE constraint
     #    does not, and would still block a reinsert with the same dates.
-    overlap = await database.fetch_one(
-        """
-        SELECT 1
-        FROM Rental
-        WHERE vehicle_id = :vehicle_id
-          AND NOT (:end_date < start_date OR :start_date > end_date)
-        LIMIT 1
-        """,
-        {
-            "vehicle_id": vehicle_id,
-            "start_date": start_date,
-            "end_date": end_date,
-        },
+    #    Predicates are written as plain range bounds so MariaDB can seek
+    #    idx_rental_vehicle_dates (vehicle_id, start_date, end_date).
+    overlap, price_per_day = await asyncio.gather(
+        _fetch_one_prepared(
+            "rental_overlap",
+            {
+                "vehicle_id": vehicle_id,
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+        ),
+        _get_vehicle_price(vehicle_id),
     )
 
-    if overlap:
+    if overlap["overlap"]:
         raise HTTPException(
             status_code=400,
             detail="Vehicle not available in the selected dates",
         )
 
-    # 3) Get vehicle pricing
-    vehicle = await database.fetch_one(
-        """
-        SELECT price_per_day, status
-        FROM Vehicle
-        WHERE vehicle_id = :vehicle_id
-          AND deleted_at IS NULL
-        """,
-        {"vehicle_id": vehicle_id},
-    )
-
-    if not vehicle:
+    # 3) Validate vehicle existence / availability
+    vehicle_status = overlap["vehicle_status"]
+    if vehicle_status is None or price_per_day is None:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     
     # 🚫 Prevent renting if the car is not available
-    if vehicle["status"] in ("rented", "maintenance"):
+    if vehicle_status in ("rented", "maintenance"):
         raise HTTPException(
             status_code=400,
             detail="This vehicle is not available for rental (currently rented or under maintenance)."
         )
 
-    price_per_day = float(vehicle["price_per_day"])
-
     # 4) Compute total days and cost (inclusive of both start and end dates)
     total_days = (end_date - start_date).days + 1
     total_cost = round(price_per_day * total_days, 2)
 
     # 5) Insert rental, catching any remaining 1062 errors
     try:
-        rental_id = await database.execute(
-            """
-            INSERT INTO Rental (
-                user_id,
-                vehicle_id,
-                start_date,
-                end_date,
-                price_at_rental,
-                total_cost
-            ) VALUES (
-                :user_id,
-                :vehicle_id,
-                :start_date,
-                :end_date,
-                :price_at_rental,
-                :total_cost
-            )
-            """,
+        rental_id = await _execute_prepared(
+            "rental_insert",
             {
                 "user_id": user_id,
                 "vehicle_id": vehicle_id,
@@ -711,42 +1118,31 @@ async def delete_rental(rental_id: int):
     Removes the row from the database so the same vehicle/date range
     can be booked again.
     """
-    # Check it exists
-    existing = await database.fetch_one(
-        "SELECT rental_id FROM Rental WHERE rental_id = :rid",
+    # Single round-trip: DELETE ... RETURNING yields no row when nothing matched
+    deleted = await database.fetch_one(
+        "DELETE FROM Rental WHERE rental_id = :rid RETURNING rental_id",
         {"rid": rental_id},
     )
-    if not existing:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Rental not found")
-
-    # Hard delete instead of soft delete
-    await database.execute(
-        "DELETE FROM Rental WHERE rental_id = :rid",
-        {"rid": rental_id},
-    )
     return None
 
-async def delete_rental(rental_id: int):
-    """
-    Cancel/delete a rental (soft delete).
-    
-    Sets `deleted_at` timestamp without removing from database.
-    Deleted rentals are excluded from all GET queries.
-    Operation is idempotent (returns 404 if already deleted).
-    """
-    # Verify rental exists and not already deleted
-    existing = await database.fetch_one(
-        "SELECT rental_id FROM Rental WHERE rental_id = :rid AND deleted_at IS NULL",
-        {"rid": rental_id},
-    )
-    if not existing:
-        raise HTTPException(status_code=404, detail="Rental not found")
 
-    await database.execute(
-        "UPDATE Rental SET deleted_at = CURRENT_TIMESTAMP WHERE rental_id = :rid",
-        {"rid": rental_id},
-    )
-    return None
+# One row (vehicle_id, overlap flag) when the rental exists and is active; no row otherwise
+_UPDATE_RENTAL_PRECHECK_SQL = """
+    SELECT r.vehicle_id,
+           EXISTS(
+               SELECT 1 FROM Rental o USE INDEX (idx_rental_vehicle_dates)
+               WHERE o.vehicle_id = r.vehicle_id
+                 AND o.start_date < :end_date
+                 AND o.end_date > :start_date
+                 AND o.rental_id <> r.rental_id
+                 AND o.deleted_at IS NULL
+           ) AS overlap
+    FROM Rental r
+    WHERE r.rental_id = :rid
+      AND r.deleted_at IS NULL
+"""
 
 
 @app.put(
@@ -773,51 +1169,31 @@ async def update_rental(rental_id: int, payload: RentalCreateRequest):
     Update rental dates with availability re-validation.
     
     **Validations:**
-    1. Rental exists and is not deleted
-    2. No overlapping rentals for the same vehicle (excludes current rental from check)
-    3. start_date < end_date
+    1. start_date < end_date
+    2. Rental exists and is not deleted
+    3. No overlapping rentals for the same vehicle (excludes current rental from check)
     
     Updates `updated_at` timestamp and recalculates totals based on current vehicle pricing.
     Note: vehicle_id cannot be changed; uses existing vehicle from database.
     """
-    # Ensure rental exists
-    existing = await database.fetch_one(
-        "SELECT rental_id, vehicle_id FROM Rental WHERE rental_id = :rid AND deleted_at IS NULL",
-        {"rid": rental_id},
-    )
-    if not existing:
-        raise HTTPException(status_code=404, detail="Rental not found")
-
-    vehicle_id = existing["vehicle_id"]
+    # Date order validation
+    if payload.start_date >= payload.end_date:
+        raise HTTPException(status_code=422, detail="Invalid date range: start_date must be before end_date")
 
-    # Overlap check excluding current rental
-    overlap = await database.fetch_one(
-        """
-        SELECT 1 FROM Rental
-        WHERE vehicle_id = :vehicle_id
-          AND rental_id <> :rid
-          AND deleted_at IS NULL
-          AND NOT (:end_date <= start_date OR :start_date >= end_date)
-        LIMIT 1
-        """,
+    # Ensure rental exists and check overlap (excluding itself) in one round-trip
+    precheck = await database.fetch_one(
+        _UPDATE_RENTAL_PRECHECK_SQL,
         {
-            "vehicle_id": vehicle_id,
             "rid": rental_id,
-            "start_date": str(payload.start_date),
-            "end_date": str(payload.end_date),
+            "start_date": payload.start_date,
+            "end_date": payload.end_date,
         },
     )
-    if overlap:
+    if not precheck:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    if precheck["overlap"]:
         raise HTTPException(status_code=400, detail="Vehicle not available in the selected dates")
 
-    # Date order validation
-    valid = await database.fetch_one(
-        "SELECT CASE WHEN :start_date < :end_date THEN 1 ELSE 0 END AS ok",
-        {"start_date": str(payload.start_date), "end_date": str(payload.end_date)},
-    )
-    if not valid or valid["ok"] != 1:
-        raise HTTPException(status_code=422, detail="Invalid date range: start_date must be before end_date")
-
     await database.execute(
         """
         UPDATE Rental
@@ -825,8 +1201,8 @@ async def update_rental(rental_id: int, payload: RentalCreateRequest):
         WHERE rental_id = :rid
         """,
         {
-            "start_date": str(payload.start_date),
-            "end_date": str(payload.end_date),
+            "start_date": payload.start_date,
+            "end_date": payload.end_date,
             "rid": rental_id,
         },
     )
@@ -850,5 +1226,6 @@ async def update_rental(rental_id: int, payload: RentalCreateRequest):
 # Static Files - Mount last to avoid route conflicts
 # =========================================================
 
-# Serve static files (simple UI demo)
-app.mount("/static", StaticFiles(directory="static"), name="static")
\ No newline at end of file
+# Serve static files (simple UI demo) only when enabled; otherwise a reverse proxy owns /static
+if SERVE_STATIC:
+    app.mount("/static", StaticFiles(directory="static", html=False, check_dir=False), name="static")
\ No newline at end of file
@@ -59,6 +59,17 @@ COLLATE=utf8mb4_unicode_ci;
 CREATE INDEX idx_vehicle_status_make_model
     ON Vehicle (status, make, model);
 
+-- Keyset pagination indexes, one per /vehicles sort column
+-- Optimizes: "Next page of vehicles after (created_at/price/year, vehicle_id)"
+CREATE INDEX idx_vehicle_created_id
+    ON Vehicle (created_at, vehicle_id);
+
+CREATE INDEX idx_vehicle_price_id
+    ON Vehicle (price_per_day, vehicle_id);
+
+CREATE INDEX idx_vehicle_year_id
+    ON Vehicle (year, vehicle_id);
+
 -- =========================================================
 -- Rental Table
 -- =========================================================